@@ -1,17 +1,16 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+import plotly.express as px
+import plotly.io as pio
+from plotly.subplots import make_subplots
 import io
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import tempfile
-import os
 import re
+import hashlib
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 
 # --- DEFAULTS ---
 defaults_str = {
@@ -36,7 +35,49 @@ defaults_num = {
     "grid_germany": 0.4,  # kg CO2e/kWh
 }
 
-grid_mix_dict = {
+UNITS = {
+    "raw_weight": "kg",
+    "finished_weight": "kg",
+    "material_emission": "kg CO₂e/kg",
+    "energy_standard": "kWh",
+    "energy_am": "kWh",
+    "argon_use_am": "m³",
+    "argon_emission_factor": "kg CO₂e/m³",
+    "transport_standard_km": "km",
+    "transport_am_km": "km",
+    "transport_factor_air": "kg CO₂e/t·km",
+    "downtime_standard_months": "months",
+    "downtime_am_weeks": "weeks",
+    "efficiency_loss": "",
+    "turbine_output": "MW",
+    "grid_germany": "kg CO₂e/kWh"
+}
+
+EXPLANATIONS = {
+    "raw_weight": "Weight of semi-finished raw material before machining.",
+    "finished_weight": "Final weight of the blade after manufacturing.",
+    "material_emission": "Emission factor for the chosen alloy material.",
+    "energy_standard": "Manufacturing energy consumption for standard process.",
+    "energy_am": "Manufacturing energy consumption for AM process.",
+    "argon_use_am": "Volume of shielding gas used in AM process.",
+    "argon_emission_factor": "Emission factor of shielding gas.",
+    "transport_standard_km": "Transport distance for standard manufacturing route.",
+    "transport_am_km": "Transport distance for AM manufacturing route (usually local).",
+    "transport_factor_air": "Emission factor for air transport per ton·km.",
+    "downtime_standard_months": "Downtime duration with standard process.",
+    "downtime_am_weeks": "Downtime duration with AM process.",
+    "efficiency_loss": "Efficiency loss rate during downtime.",
+    "turbine_output": "Output power of the turbine.",
+    "grid_germany": "Grid mix emission factor for Germany."
+}
+
+# (session key, label, caption) for each Page 1 numeric input
+WIDGET_SPECS = tuple(
+    (key, f"{key.replace('_',' ').title()} ({UNITS[key]})", EXPLANATIONS.get(key, ""))
+    for key in defaults_num
+)
+
+GRID_MIX = pd.Series({
     "Germany": 0.4,
     "USA": 0.25,
     "China": 0.75,
@@ -47,13 +88,51 @@ grid_mix_dict = {
     "Brazil": 0.08,
     "Australia": 0.58,
     "Canada": 0.16
+})  # kg CO2e/kWh
+
+COUNTRIES_TUPLE = tuple(GRID_MIX.index)
+countries_arr = GRID_MIX.index.to_numpy()
+grid_arr = GRID_MIX.to_numpy()
+GRID_MIX_ITEMS = tuple(GRID_MIX.items())  # hashable cache key for per-country computations
+
+# ISO-3 codes let the report map index Plotly's country table directly instead of matching names
+COUNTRY_ISO3 = {
+    "Germany": "DEU",
+    "USA": "USA",
+    "China": "CHN",
+    "Japan": "JPN",
+    "France": "FRA",
+    "UK": "GBR",
+    "India": "IND",
+    "Brazil": "BRA",
+    "Australia": "AUS",
+    "Canada": "CAN"
 }
 
+STAGES = ["Material", "Manufacturing", "Transport", "Downtime"]
+
+# Shared Plotly layouts for the Page 2 charts
+LEGEND_TOP = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+LAYOUT_GROUPED = dict(barmode='group', yaxis_title="kg CO₂e")
+LAYOUT_STACKED = dict(barmode='stack', yaxis_title="kg CO₂e", legend=LEGEND_TOP)
+
+# --- SESSION STATE ---
+# Inputs live in session_state so they survive page switches and give the cached
+# computations stable arguments. Re-assigning keeps Streamlit from discarding the
+# widget values while their page is not rendered.
+st.session_state["material_type"] = st.session_state.get("material_type", defaults_str["material_type"])
+for key, val in defaults_num.items():
+    st.session_state[key] = st.session_state.get(key, val)
+st.session_state["selected_countries"] = st.session_state.get("selected_countries", list(COUNTRIES_TUPLE[:3]))
+# Snapshot of the numeric inputs as of the last "Apply"; Page 2 computes from this only
+st.session_state.setdefault("applied_inputs", dict(defaults_num))
+
 # --- PAGE SELECTION ---
 pages = ["Page 1: Input Data", "Page 2: Results"]
 page = st.sidebar.selectbox("Select Page", pages)
 
 # --- Functions ---
+# The *_co2 helpers are plain arithmetic, so they work on scalars and on NumPy arrays of grid mixes alike
 def material_co2(raw_weight, factor):
     return raw_weight * factor
 
@@ -66,84 +145,478 @@ def transport_co2(weight_tons, km, factor):
 def downtime_co2(output_mw, loss_rate, hours, grid_mix):
     return (output_mw * loss_rate * hours) * grid_mix
 
-# --- PAGE 1 ---
-if page == pages[0]:
-    st.title("Production Site Input Requirements - Blade Case")
+def compute_baseline(raw_weight, finished_weight, material_emission, energy_standard, energy_am,
+                     argon_use_am, argon_emission_factor, transport_standard_km, transport_am_km,
+                     transport_factor_air, hours_std, hours_am, turbine_output, efficiency_loss, grid):
+    """Lifecycle stage emissions (Standard vs AM) for a single grid mix"""
+    weight_tons_std = finished_weight / 1000
+    weight_tons_am = finished_weight / 1000
+    return {
+        "mat_std": material_co2(raw_weight, material_emission),
+        "mat_am": material_co2(finished_weight, material_emission),
+        "manuf_std": manufacturing_co2(energy_standard, grid),
+        "manuf_am": manufacturing_co2(energy_am, grid, argon_use_am, argon_emission_factor),
+        "transport_std": transport_co2(weight_tons_std, transport_standard_km, transport_factor_air),
+        "transport_am": transport_co2(weight_tons_am, transport_am_km, transport_factor_air),
+        "downtime_std": downtime_co2(turbine_output, efficiency_loss, hours_std, grid),
+        "downtime_am": downtime_co2(turbine_output, efficiency_loss, hours_am, grid),
+    }
 
-    st.subheader("Material Information")
-    defaults_str["material_type"] = st.text_input("Material Type", defaults_str["material_type"])
-    st.caption("Type of alloy used for blades (example: Ni-based alloy). Determines material emission factor.")
-
-    for key, val in defaults_num.items():
-        units = {
-            "raw_weight": "kg",
-            "finished_weight": "kg",
-            "material_emission": "kg CO₂e/kg",
-            "energy_standard": "kWh",
-            "energy_am": "kWh",
-            "argon_use_am": "m³",
-            "argon_emission_factor": "kg CO₂e/m³",
-            "transport_standard_km": "km",
-            "transport_am_km": "km",
-            "transport_factor_air": "kg CO₂e/t·km",
-            "downtime_standard_months": "months",
-            "downtime_am_weeks": "weeks",
-            "efficiency_loss": "",
-            "turbine_output": "MW",
-            "grid_germany": "kg CO₂e/kWh"
-        }
-        defaults_num[key] = st.number_input(
-            f"{key.replace('_',' ').title()} ({units[key]})",
-            value=val
-        )
-        explanations = {
-            "raw_weight": "Weight of semi-finished raw material before machining.",
-            "finished_weight": "Final weight of the blade after manufacturing.",
-            "material_emission": "Emission factor for the chosen alloy material.",
-            "energy_standard": "Manufacturing energy consumption for standard process.",
-            "energy_am": "Manufacturing energy consumption for AM process.",
-            "argon_use_am": "Volume of shielding gas used in AM process.",
-            "argon_emission_factor": "Emission factor of shielding gas.",
-            "transport_standard_km": "Transport distance for standard manufacturing route.",
-            "transport_am_km": "Transport distance for AM manufacturing route (usually local).",
-            "transport_factor_air": "Emission factor for air transport per ton·km.",
-            "downtime_standard_months": "Downtime duration with standard process.",
-            "downtime_am_weeks": "Downtime duration with AM process.",
-            "efficiency_loss": "Efficiency loss rate during downtime.",
-            "turbine_output": "Output power of the turbine.",
-            "grid_germany": "Grid mix emission factor for Germany."
-        }
-        st.caption(explanations.get(key, ""))
+@st.cache_data
+def compute_country_frame(grid_val, energy_standard, energy_am, argon_use_am, argon_emission_factor,
+                          turbine_output, efficiency_loss, hours_std, hours_am,
+                          mat_std, mat_am, transport_std, transport_am):
+    """Standard vs AM stage table for the grid mix of one production location"""
+    manuf_std_c = manufacturing_co2(energy_standard, grid_val)
+    manuf_am_c  = manufacturing_co2(energy_am, grid_val, argon_use_am, argon_emission_factor)
+    downtime_std_c = downtime_co2(turbine_output, efficiency_loss, hours_std, grid_val)
+    downtime_am_c  = downtime_co2(turbine_output, efficiency_loss, hours_am, grid_val)
 
-# --- PAGE 2 ---
-elif page == pages[1]:
-    st.title("Blade Case - LCA Results")
+    return pd.DataFrame({
+        "Stage": STAGES,
+        "Standard": [mat_std, manuf_std_c, transport_std, downtime_std_c],
+        "AM": [mat_am, manuf_am_c, transport_am, downtime_am_c]
+    })
 
-    weight_tons_std = defaults_num["finished_weight"] / 1000
-    weight_tons_am = defaults_num["finished_weight"] / 1000
+@st.cache_data
+def build_lifecycle_figure(std_vals, am_vals):
+    """Grouped Standard vs AM bar chart over the lifecycle stages, keyed on plain float tuples"""
+    fig = go.Figure(data=[
+        go.Bar(name='Standard', x=STAGES, y=std_vals, texttemplate="%{y:.2f}", textposition='auto'),
+        go.Bar(name='AM', x=STAGES, y=am_vals, texttemplate="%{y:.2f}", textposition='auto')
+    ])
+    fig.update_layout(LAYOUT_GROUPED)
+    return fig
 
-    hours_std = defaults_num["downtime_standard_months"] * 30 * 24
-    hours_am = defaults_num["downtime_am_weeks"] * 7 * 24
+def highlight_cells(df, column, colors):
+    """Minimal Styler colouring selected rows of one column; number formatting is left to column_config"""
+    return df.style.apply(
+        lambda col: [f"background-color: {colors[i]}" if i in colors else "" for i in col.index],
+        subset=[column]
+    )
 
-    # Germany baseline calculations
-    mat_std = material_co2(defaults_num["raw_weight"], defaults_num["material_emission"])
-    mat_am  = material_co2(defaults_num["finished_weight"], defaults_num["material_emission"])
+@st.cache_data
+def build_country_view(country, df_country):
+    """Comparison table (with total row) and grouped bar chart for one production location"""
+    # Create comparison table with the total row already in place
+    std_arr = df_country["Standard"].to_numpy()
+    std_arr = np.append(std_arr, std_arr.sum())
+    am_arr = df_country["AM"].to_numpy()
+    am_arr = np.append(am_arr, am_arr.sum())
+    diff_arr = std_arr - am_arr
+    # Stages with no standard emissions report 0% instead of dividing by zero
+    pct_arr = np.divide(diff_arr * 100, std_arr, out=np.zeros_like(diff_arr), where=std_arr != 0)
+
+    df_comparison = pd.DataFrame({
+        "Stage": [*STAGES, "Total"],
+        "Standard": std_arr,
+        "AM": am_arr,
+        "Difference (Standard - AM)": diff_arr,
+        "% Reduction": pct_arr
+    })
 
-    manuf_std = manufacturing_co2(defaults_num["energy_standard"], defaults_num["grid_germany"])
-    manuf_am  = manufacturing_co2(defaults_num["energy_am"], defaults_num["grid_germany"], defaults_num["argon_use_am"], defaults_num["argon_emission_factor"])
+    fig3 = build_lifecycle_figure(tuple(df_country["Standard"]), tuple(df_country["AM"]))
+    fig3.update_layout(title=f"Comparison for {country}")
 
-    transport_std = transport_co2(weight_tons_std, defaults_num["transport_standard_km"], defaults_num["transport_factor_air"])
-    transport_am  = transport_co2(weight_tons_am, defaults_num["transport_am_km"], defaults_num["transport_factor_air"])
+    return df_comparison, fig3
+
+@st.cache_data
+def build_multi_country_view(selected, mat_std, transport_std, energy_standard, turbine_output, efficiency_loss, hours_std):
+    """Stage table and stacked bar chart (standard process) for a set of countries"""
+    # Calculate emissions for all selected countries at once
+    mask = np.isin(countries_arr, list(selected))
+    g = grid_arr[mask]
+    manuf = manufacturing_co2(energy_standard, g)
+    downtime = downtime_co2(turbine_output, efficiency_loss, hours_std, g)
+
+    df_multi = pd.DataFrame({
+        "Country": countries_arr[mask],
+        # Country-invariant stages are scalars; pandas broadcasts them down the column
+        "Material": mat_std,
+        "Manufacturing": manuf,
+        "Transport": transport_std,
+        "Downtime": downtime,
+        "Total": mat_std + manuf + transport_std + downtime
+    })
 
-    downtime_std = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_std, defaults_num["grid_germany"])
-    downtime_am  = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_am, defaults_num["grid_germany"])
+    # Create stacked bar chart
+    df_long = df_multi.melt(id_vars=["Country", "Total"], value_vars=STAGES, var_name="Stage", value_name="kg CO₂e")
+    fig_multi = px.bar(df_long, x="Country", y="kg CO₂e", color="Stage", text_auto='.2f',
+                       hover_data={"Total": ':.2f'})
+    fig_multi.update_traces(textposition='inside')
+    fig_multi.update_layout(LAYOUT_STACKED, title="Stacked Lifecycle Emissions by Country (Standard Process)")
 
+    return df_multi, fig_multi
+
+def compute_all_country_results(mat_std, mat_am, transport_std, transport_am, energy_standard, energy_am,
+                                argon_use_am, argon_emission_factor, hours_std, hours_am, turbine_output,
+                                efficiency_loss, grid_mix_items):
+    """Baseline vs AM totals and reduction for every (country, grid mix) pair
+
+    The country-independent stages (material, transport) come in precomputed
+    """
+    names = [country for country, _ in grid_mix_items]
+    grid_factors = np.fromiter((grid for _, grid in grid_mix_items), dtype=np.float64, count=len(grid_mix_items))
+
+    # Standard (Baseline) and AM totals for all countries in one broadcast
+    total_std = (mat_std + manufacturing_co2(energy_standard, grid_factors) + transport_std
+                 + downtime_co2(turbine_output, efficiency_loss, hours_std, grid_factors))
+    total_am = (mat_am + manufacturing_co2(energy_am, grid_factors, argon_use_am, argon_emission_factor) + transport_am
+                + downtime_co2(turbine_output, efficiency_loss, hours_am, grid_factors))
+
+    # Calculate reduction
+    reduction_pct = np.divide(total_std - total_am, total_std, out=np.zeros_like(total_std), where=total_std > 0) * 100
+
+    return pd.DataFrame({
+        'Country': names,
+        'Baseline (kg CO2e)': total_std,
+        'AM Scenario (kg CO2e)': total_am,
+        'Reduction (%)': reduction_pct
+    })
+
+@st.cache_data
+def page2_precompute(inputs_items):
+    """Everything Page 2 derives from the applied inputs alone, computed once per input set"""
+    inputs = dict(inputs_items)
+    hours_std = inputs["downtime_standard_months"] * 30 * 24
+    hours_am = inputs["downtime_am_weeks"] * 7 * 24
+
+    # Germany baseline calculations
+    baseline = compute_baseline(
+        inputs["raw_weight"], inputs["finished_weight"], inputs["material_emission"],
+        inputs["energy_standard"], inputs["energy_am"],
+        inputs["argon_use_am"], inputs["argon_emission_factor"],
+        inputs["transport_standard_km"], inputs["transport_am_km"], inputs["transport_factor_air"],
+        hours_std, hours_am,
+        inputs["turbine_output"], inputs["efficiency_loss"], inputs["grid_germany"]
+    )
     df = pd.DataFrame({
-        "Stage": ["Material", "Manufacturing", "Transport", "Downtime"],
-        "Standard": [mat_std, manuf_std, transport_std, downtime_std],
-        "AM": [mat_am, manuf_am, transport_am, downtime_am]
+        "Stage": STAGES,
+        "Standard": [baseline["mat_std"], baseline["manuf_std"], baseline["transport_std"], baseline["downtime_std"]],
+        "AM": [baseline["mat_am"], baseline["manuf_am"], baseline["transport_am"], baseline["downtime_am"]]
     })
 
+    return SimpleNamespace(
+        hours_std=hours_std,
+        hours_am=hours_am,
+        df=df,
+        results=compute_all_country_results(
+            baseline["mat_std"], baseline["mat_am"], baseline["transport_std"], baseline["transport_am"],
+            inputs["energy_standard"], inputs["energy_am"],
+            inputs["argon_use_am"], inputs["argon_emission_factor"],
+            hours_std, hours_am, inputs["turbine_output"], inputs["efficiency_loss"],
+            GRID_MIX_ITEMS
+        ),
+        **baseline
+    )
+
+# Report bar charts drop their per-bar outside labels beyond this many countries
+MAX_LABELLED_BARS = 15
+
+def build_report_bar_figure(countries, baseline, am):
+    """Grouped Baseline vs AM bar chart for the report"""
+    show_text = len(countries) <= MAX_LABELLED_BARS
+    fig_bar = go.Figure()
+    fig_bar.add_trace(go.Bar(
+        name='Baseline',
+        x=countries,
+        y=baseline,
+        marker_color='#5b2c6f',
+        texttemplate='%{y:.1f}' if show_text else None,
+        textposition='outside' if show_text else None
+    ))
+    fig_bar.add_trace(go.Bar(
+        name='AM Scenario',
+        x=countries,
+        y=am,
+        marker_color='#008b8b',
+        texttemplate='%{y:.1f}' if show_text else None,
+        textposition='outside' if show_text else None
+    ))
+    fig_bar.update_layout(
+        barmode='group',
+        xaxis_title='Country',
+        yaxis_title='GWP (kg CO₂e)',
+        height=400,
+        showlegend=True,
+        legend=LEGEND_TOP
+    )
+    return fig_bar
+
+def build_report_line_figure(countries, baseline, am):
+    """Dual-line Baseline vs AM trend chart for the report (WebGL traces)"""
+    fig_line = go.Figure()
+    fig_line.add_trace(go.Scattergl(
+        x=countries,
+        y=baseline,
+        mode='lines+markers',
+        name='Baseline',
+        line=dict(color='#5b2c6f', width=3),
+        marker=dict(size=10)
+    ))
+    fig_line.add_trace(go.Scattergl(
+        x=countries,
+        y=am,
+        mode='lines+markers',
+        name='AM Scenario',
+        line=dict(color='#008b8b', width=3),
+        marker=dict(size=10)
+    ))
+    fig_line.update_layout(
+        xaxis_title='Country',
+        yaxis_title='GWP (kg CO₂e)',
+        height=400,
+        showlegend=True,
+        legend=LEGEND_TOP
+    )
+    return fig_line
+
+def build_report_reduction_figure(countries, reduction):
+    """Reduction rate bar chart for the report"""
+    show_text = len(countries) <= MAX_LABELLED_BARS
+    fig_reduction = go.Figure()
+    fig_reduction.add_trace(go.Bar(
+        x=countries,
+        y=reduction,
+        marker_color='#2ecc71',
+        texttemplate='%{y:.1f}%' if show_text else None,
+        textposition='outside' if show_text else None
+    ))
+    fig_reduction.update_layout(
+        xaxis_title='Country',
+        yaxis_title='Reduction (%)',
+        height=350,
+        showlegend=False
+    )
+    return fig_reduction
+
+def build_report_map_figure(countries, reduction):
+    """World choropleth of the reduction rate for the report"""
+    # Rows added in the results editor may name countries without a known code
+    codes = [COUNTRY_ISO3.get(country) for country in countries]
+    use_iso3 = None not in codes
+    fig_map = go.Figure(data=go.Choropleth(
+        locations=codes if use_iso3 else countries,
+        locationmode='ISO-3' if use_iso3 else 'country names',
+        z=reduction,
+        text=countries,
+        colorscale='Greens',
+        colorbar_title='Reduction %',
+        marker_line_color='darkgray',
+        marker_line_width=0.5,
+    ))
+    fig_map.update_layout(
+        geo=dict(
+            showframe=False,
+            showcoastlines=True,
+            projection_type='natural earth'
+        ),
+        height=400
+    )
+    return fig_map
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_figure_png(fig_json, width, height):
+    """PNG bytes of a serialized Plotly figure, rendered via Kaleido once per figure and size"""
+    return pio.to_image(pio.from_json(fig_json), format="png", width=width, height=height)
+
+def build_report_overview_figure(fig_bar, fig_line, fig_reduction, fig_map):
+    """The four report charts as one 2x2 subplot figure for the on-page preview"""
+    fig_all = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=["Baseline vs AM Scenario", "Dual-line Chart", "Reduction Rate by Country",
+                        "Geographic Distribution of GWP Reduction"],
+        specs=[[{"type": "xy"}, {"type": "xy"}], [{"type": "xy"}, {"type": "choropleth"}]],
+        vertical_spacing=0.12
+    )
+    for trace in fig_bar.data:
+        fig_all.add_trace(trace, row=1, col=1)
+    for trace in fig_line.data:
+        fig_all.add_trace(trace, row=1, col=2)
+    for trace in fig_reduction.data:
+        fig_all.add_trace(trace, row=2, col=1)
+    fig_all.add_trace(fig_map.data[0], row=2, col=2)
+    # add_trace copies, so restyling here leaves the individual PDF figures untouched;
+    # the dual-line chart repeats the bar chart's series and reuses their legend entries
+    fig_all.update_traces(showlegend=False, row=1, col=2)
+    fig_all.update_traces(showlegend=False, row=2, col=1)
+    fig_all.update_traces(colorbar=dict(title='Reduction %', len=0.45, y=0.22), selector=dict(type='choropleth'))
+    fig_all.update_layout(barmode='group', height=800, legend=LEGEND_TOP)
+    fig_all.update_geos(showframe=False, showcoastlines=True, projection_type='natural earth')
+    fig_all.update_yaxes(title_text='GWP (kg CO₂e)', row=1, col=1)
+    fig_all.update_yaxes(title_text='GWP (kg CO₂e)', row=1, col=2)
+    fig_all.update_yaxes(title_text='Reduction (%)', row=2, col=1)
+    return fig_all
+
+def column_means(df, columns):
+    """Means of the given numeric columns in one pass; blank (NaN) cells are skipped like Series.mean does"""
+    return np.nanmean(df[columns].to_numpy(dtype=np.float64), axis=0)
+
+def results_frame_key(df):
+    """Content digest of a results frame (values and column names) for use as a cache key"""
+    digest = hashlib.md5(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(",".join(df.columns).encode())
+    return digest.hexdigest()
+
+# Bounded: one entry per distinct edit of the results table, across all sessions
+@st.cache_resource(max_entries=32)
+def build_report_figures(results_key, _results):
+    """Combined preview figure plus the bar, dual-line, reduction and map figures as JSON, built once per results_key"""
+    countries = tuple(_results['Country'])
+    baseline = tuple(_results['Baseline (kg CO2e)'])
+    am = tuple(_results['AM Scenario (kg CO2e)'])
+    reduction = tuple(_results['Reduction (%)'])
+    fig_bar = build_report_bar_figure(countries, baseline, am)
+    fig_line = build_report_line_figure(countries, baseline, am)
+    fig_reduction = build_report_reduction_figure(countries, reduction)
+    fig_map = build_report_map_figure(countries, reduction)
+    fig_all = build_report_overview_figure(fig_bar, fig_line, fig_reduction, fig_map)
+    # The PDF only renders the individual charts, so they are serialized once here rather than per report
+    return fig_all, tuple(fig.to_json(engine="orjson") for fig in (fig_bar, fig_line, fig_reduction, fig_map))
+
+def report_digest(*parts):
+    """BLAKE2b digest of the strings a generated PDF report depends on"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=96)
+def render_figure_svg(fig_json, width, height):
+    """SVG bytes of a serialized Plotly figure, rendered via Kaleido once per figure and size"""
+    fig = pio.from_json(fig_json)
+    # Kaleido rasterizes WebGL traces inside SVG output, so draw them as plain SVG scatter
+    fig = go.Figure(
+        data=[go.Scatter(trace.to_plotly_json()) if trace.type == 'scattergl' else trace for trace in fig.data],
+        layout=fig.layout
+    )
+    return pio.to_image(fig, format="svg", width=width, height=height)
+
+def svg_drawing(svg_bytes, width):
+    """ReportLab drawing of an SVG image, scaled to the given width"""
+    from svglib.svglib import svg2rlg
+    drawing = svg2rlg(io.BytesIO(svg_bytes))
+    factor = width / drawing.width
+    drawing.scale(factor, factor)
+    drawing.width, drawing.height = drawing.width * factor, drawing.height * factor
+    return drawing
+
+# Markdown-style bold and the HTML entities ReportLab paragraphs need escaped
+BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+def format_text_for_pdf(text):
+    """Convert markdown-style bold (**text**) to HTML bold tags and escape HTML entities"""
+    return BOLD_RE.sub(r'<b>\1</b>', text.translate(HTML_ESCAPE))
+
+def format_paragraphs_for_pdf(text):
+    """Split text into blank-line separated paragraphs, keeping single line breaks as <br/>"""
+    return [format_text_for_pdf(block.strip()).replace('\n', '<br/>')
+            for block in PARAGRAPH_BREAK_RE.split(text) if block.strip()]
+
+def escape_html(text):
+    """Escape HTML special characters"""
+    return str(text).translate(HTML_ESCAPE)
+
+@st.cache_resource
+def pdf_styles():
+    """ReportLab stylesheet and custom report styles, built with the first report and then reused"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'ReportTitle',
+        parent=styles['Heading1'],
+        fontSize=22,
+        textColor=colors.HexColor('#5b2c6f'),
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+
+    heading1_style = ParagraphStyle(
+        'CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#5b2c6f'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    )
+
+    heading2_style = ParagraphStyle(
+        'CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=colors.HexColor('#008b8b'),
+        spaceAfter=8,
+        spaceBefore=8,
+        fontName='Helvetica-Bold'
+    )
+
+    return styles, title_style, heading1_style, heading2_style
+
+@st.cache_resource
+def pdf_results_table_style(n_rows):
+    """TableStyle of an n_rows PDF results table (header, zebra rows, bold average row)"""
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+
+    # Explicit per-row fills for the body rows between the header and the average row
+    zebra = [colors.white, colors.HexColor('#f9f9f9')]
+    row_backgrounds = [('BACKGROUND', (0, r), (-1, r), zebra[(r - 1) % 2]) for r in range(1, n_rows - 1)]
+
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5b2c6f')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        *row_backgrounds,
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e0e0e0')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ])
+
+# --- PAGE 1 ---
+if page == pages[0]:
+    st.title("Production Site Input Requirements - Blade Case")
+
+    # All inputs are committed together on submit instead of one rerun per widget
+    with st.form("inputs"):
+        st.subheader("Material Information")
+        st.text_input("Material Type", key="material_type")
+        st.caption("Type of alloy used for blades (example: Ni-based alloy). Determines material emission factor.")
+
+        for key, label, caption in WIDGET_SPECS:
+            st.number_input(label, key=key)
+            st.caption(caption)
+
+        if st.form_submit_button("Apply"):
+            st.session_state["applied_inputs"] = {key: st.session_state[key] for key in defaults_num}
+
+# --- PAGE 2 ---
+elif page == pages[1]:
+    st.title("Blade Case - LCA Results")
+
+    inputs = st.session_state["applied_inputs"]
+
+    # One cache lookup per rerun covers the scalars, the Germany table and the all-country results
+    pre = page2_precompute(tuple(inputs.items()))
+    hours_std, hours_am = pre.hours_std, pre.hours_am
+    mat_std, mat_am = pre.mat_std, pre.mat_am
+    transport_std, transport_am = pre.transport_std, pre.transport_am
+    df = pre.df
+
     tab1, tab2, tab3, tab4 = st.tabs(["Lifecycle Breakdown", "Scenario by Location", "Multi-Country Comparison", "PDF Report Generator"])
 
     with tab1:
@@ -157,162 +630,63 @@ elif page == pages[1]:
         total_std = df["Standard"].sum()
         total_am = df["AM"].sum()
         st.metric("CO₂ Reduction (%)", round(((total_std-total_am)/total_std)*100, 2))
-        fig = go.Figure(data=[
-            go.Bar(name='Standard', x=df["Stage"], y=df["Standard"], text=df["Standard"], textposition='auto'),
-            go.Bar(name='AM', x=df["Stage"], y=df["AM"], text=df["AM"], textposition='auto')
-        ])
-        fig.update_layout(barmode='group', yaxis_title="kg CO₂e")
-        st.plotly_chart(fig)
+        fig = build_lifecycle_figure(tuple(df["Standard"]), tuple(df["AM"]))
+        st.plotly_chart(fig, theme=None)
 
     with tab2:
         st.subheader("Scenario by Production Location")
-        country_select = st.selectbox("Select production location", list(grid_mix_dict.keys()), index=0)
-        grid_val = grid_mix_dict[country_select]
-
-        manuf_std_c = manufacturing_co2(defaults_num["energy_standard"], grid_val)
-        manuf_am_c  = manufacturing_co2(defaults_num["energy_am"], grid_val, defaults_num["argon_use_am"], defaults_num["argon_emission_factor"])
-        downtime_std_c = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_std, grid_val)
-        downtime_am_c  = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_am, grid_val)
-
-        df_country = pd.DataFrame({
-            "Stage": ["Material", "Manufacturing", "Transport", "Downtime"],
-            "Standard": [mat_std, manuf_std_c, transport_std, downtime_std_c],
-            "AM": [mat_am, manuf_am_c, transport_am, downtime_am_c]
-        })
-        
-        # Create comparison table
-        df_comparison = df_country.copy()
-        df_comparison["Difference (Standard - AM)"] = df_comparison["Standard"] - df_comparison["AM"]
-        df_comparison["% Reduction"] = ((df_comparison["Standard"] - df_comparison["AM"]) / df_comparison["Standard"] * 100).round(2)
-        
-        # Add total row
-        total_std_c = df_comparison["Standard"].sum()
-        total_am_c = df_comparison["AM"].sum()
-        total_diff = total_std_c - total_am_c
-        total_reduction = ((total_std_c - total_am_c) / total_std_c * 100)
-        
-        df_total = pd.DataFrame({
-            "Stage": ["Total"],
-            "Standard": [total_std_c],
-            "AM": [total_am_c],
-            "Difference (Standard - AM)": [total_diff],
-            "% Reduction": [total_reduction]
-        })
-        
-        df_comparison = pd.concat([df_comparison, df_total], ignore_index=True)
-        
-        st.dataframe(df_comparison.style.format({
-            "Standard": "{:.2f}",
-            "AM": "{:.2f}",
-            "Difference (Standard - AM)": "{:.2f}",
-            "% Reduction": "{:.2f}%"
-        }).highlight_max(subset=["% Reduction"], color='lightgreen'))
+        country_select = st.selectbox("Select production location", COUNTRIES_TUPLE, index=0)
+        grid_val = GRID_MIX.loc[country_select]
+
+        df_country = compute_country_frame(
+            grid_val, inputs["energy_standard"], inputs["energy_am"],
+            inputs["argon_use_am"], inputs["argon_emission_factor"],
+            inputs["turbine_output"], inputs["efficiency_loss"], hours_std, hours_am,
+            mat_std, mat_am, transport_std, transport_am
+        )
+        df_comparison, fig3 = build_country_view(country_select, df_country)
+
+        st.dataframe(
+            highlight_cells(df_comparison, "% Reduction", {df_comparison["% Reduction"].idxmax(): 'lightgreen'}),
+            column_config={
+                "Standard": st.column_config.NumberColumn(format="%.2f"),
+                "AM": st.column_config.NumberColumn(format="%.2f"),
+                "Difference (Standard - AM)": st.column_config.NumberColumn(format="%.2f"),
+                "% Reduction": st.column_config.NumberColumn(format="%.2f%%")
+            }
+        )
         
+        total_diff, total_reduction = df_comparison.iloc[-1][["Difference (Standard - AM)", "% Reduction"]]
         st.metric("Total CO₂ Reduction", f"{total_diff:.2f} kg CO₂e", f"{total_reduction:.2f}%")
-        
-        fig3 = go.Figure(data=[
-            go.Bar(name='Standard', x=df_country["Stage"], y=df_country["Standard"], text=df_country["Standard"], textposition='auto'),
-            go.Bar(name='AM', x=df_country["Stage"], y=df_country["AM"], text=df_country["AM"], textposition='auto')
-        ])
-        fig3.update_layout(barmode='group', yaxis_title="kg CO₂e", title=f"Comparison for {country_select}")
-        st.plotly_chart(fig3)
+        st.plotly_chart(fig3, theme=None)
 
     with tab3:
         st.subheader("Multi-Country Comparison")
         st.caption("Select countries to compare total emissions by lifecycle stage")
         
-        # Create checkboxes for country selection
-        st.write("**Select Countries:**")
-        cols = st.columns(5)
-        selected_countries = []
-        
-        countries_list = list(grid_mix_dict.keys())
-        for idx, country in enumerate(countries_list):
-            with cols[idx % 5]:
-                if st.checkbox(country, value=(idx < 3), key=f"country_{country}"):
-                    selected_countries.append(country)
+        selected_countries = st.multiselect("Select Countries", options=COUNTRIES_TUPLE, key="selected_countries")
         
         if len(selected_countries) == 0:
             st.warning("Please select at least one country to compare.")
         else:
-            # Calculate emissions for each selected country
-            comparison_data = {
-                "Country": [],
-                "Material": [],
-                "Manufacturing": [],
-                "Transport": [],
-                "Downtime": [],
-                "Total": []
-            }
-            
-            for country in selected_countries:
-                grid_val = grid_mix_dict[country]
-                
-                # Calculate lifecycle stages
-                manuf_c = manufacturing_co2(defaults_num["energy_standard"], grid_val)
-                downtime_c = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_std, grid_val)
-                
-                comparison_data["Country"].append(country)
-                comparison_data["Material"].append(mat_std)
-                comparison_data["Manufacturing"].append(manuf_c)
-                comparison_data["Transport"].append(transport_std)
-                comparison_data["Downtime"].append(downtime_c)
-                comparison_data["Total"].append(mat_std + manuf_c + transport_std + downtime_c)
-            
-            df_multi = pd.DataFrame(comparison_data)
-            
+            df_multi, fig_multi = build_multi_country_view(
+                frozenset(selected_countries), mat_std, transport_std,
+                inputs["energy_standard"], inputs["turbine_output"], inputs["efficiency_loss"], hours_std
+            )
+
             # Display summary table
-            st.dataframe(df_multi.style.format({
-                "Material": "{:.2f}",
-                "Manufacturing": "{:.2f}",
-                "Transport": "{:.2f}",
-                "Downtime": "{:.2f}",
-                "Total": "{:.2f}"
-            }).highlight_max(subset=["Total"], color='lightcoral').highlight_min(subset=["Total"], color='lightgreen'))
-            
-            # Create stacked bar chart
-            fig_multi = go.Figure()
-            
-            fig_multi.add_trace(go.Bar(
-                name='Material',
-                x=df_multi["Country"],
-                y=df_multi["Material"],
-                text=df_multi["Material"].round(2),
-                textposition='inside'
-            ))
-            
-            fig_multi.add_trace(go.Bar(
-                name='Manufacturing',
-                x=df_multi["Country"],
-                y=df_multi["Manufacturing"],
-                text=df_multi["Manufacturing"].round(2),
-                textposition='inside'
-            ))
-            
-            fig_multi.add_trace(go.Bar(
-                name='Transport',
-                x=df_multi["Country"],
-                y=df_multi["Transport"],
-                text=df_multi["Transport"].round(2),
-                textposition='inside'
-            ))
-            
-            fig_multi.add_trace(go.Bar(
-                name='Downtime',
-                x=df_multi["Country"],
-                y=df_multi["Downtime"],
-                text=df_multi["Downtime"].round(2),
-                textposition='inside'
-            ))
-            
-            fig_multi.update_layout(
-                barmode='stack',
-                yaxis_title="kg CO₂e",
-                title="Stacked Lifecycle Emissions by Country (Standard Process)",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            st.dataframe(
+                highlight_cells(df_multi, "Total", {
+                    df_multi["Total"].idxmax(): 'lightcoral',
+                    df_multi["Total"].idxmin(): 'lightgreen'
+                }),
+                column_config={
+                    col: st.column_config.NumberColumn(format="%.2f")
+                    for col in [*STAGES, "Total"]
+                }
             )
             
-            st.plotly_chart(fig_multi, use_container_width=True)
+            st.plotly_chart(fig_multi, use_container_width=True, theme=None)
 
     with tab4:
         st.subheader("📄 LCA Report - Baseline vs AM Scenario")
@@ -352,151 +726,51 @@ elif page == pages[1]:
         # 3. Results - Multi-Country GWP Comparison
         st.header("3. Results - GWP Comparison")
         st.markdown("**Baseline vs AM Scenario GWP by Country**")
-        st.info("📌 The data below is automatically calculated based on your input parameters from Page 1")
-        
-        # Calculate for all countries
-        results_data = {
-            'Country': [],
-            'Baseline (kg CO2e)': [],
-            'AM Scenario (kg CO2e)': [],
-            'Reduction (%)': []
-        }
-        
-        for country, grid_val in grid_mix_dict.items():
-            # Standard (Baseline) calculation
-            manuf_std_c = manufacturing_co2(defaults_num["energy_standard"], grid_val)
-            downtime_std_c = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_std, grid_val)
-            total_std_c = mat_std + manuf_std_c + transport_std + downtime_std_c
-            
-            # AM Scenario calculation
-            manuf_am_c = manufacturing_co2(defaults_num["energy_am"], grid_val, defaults_num["argon_use_am"], defaults_num["argon_emission_factor"])
-            downtime_am_c = downtime_co2(defaults_num["turbine_output"], defaults_num["efficiency_loss"], hours_am, grid_val)
-            total_am_c = mat_am + manuf_am_c + transport_am + downtime_am_c
-            
-            # Calculate reduction
-            reduction_pct = ((total_std_c - total_am_c) / total_std_c * 100) if total_std_c > 0 else 0
-            
-            results_data['Country'].append(country)
-            results_data['Baseline (kg CO2e)'].append(round(total_std_c, 2))
-            results_data['AM Scenario (kg CO2e)'].append(round(total_am_c, 2))
-            results_data['Reduction (%)'].append(round(reduction_pct, 1))
-        
-        results_df = pd.DataFrame(results_data)
-        
-        st.dataframe(results_df.style.format({
-            'Baseline (kg CO2e)': '{:.2f}',
-            'AM Scenario (kg CO2e)': '{:.2f}',
-            'Reduction (%)': '{:.1f}%'
-        }).background_gradient(subset=['Reduction (%)'], cmap='Greens'), use_container_width=True)
-        
-        # Allow user to edit results if needed
-        st.markdown("**Optional: Edit results manually for the report**")
-        edited_results = st.data_editor(results_df, num_rows="dynamic", use_container_width=True, key="edited_results")
-        
-        # 4. Visualization Preview
-        st.header("4. Visualization Preview")
-        st.markdown("The following charts will be included in the PDF report:")
-        
-        col_v1, col_v2 = st.columns(2)
-        
-        with col_v1:
-            st.subheader("Bar Chart: Baseline vs AM Scenario")
-            fig_bar = go.Figure()
-            fig_bar.add_trace(go.Bar(
-                name='Baseline',
-                x=edited_results['Country'],
-                y=edited_results['Baseline (kg CO2e)'],
-                marker_color='#5b2c6f',
-                text=edited_results['Baseline (kg CO2e)'].round(1),
-                textposition='outside'
-            ))
-            fig_bar.add_trace(go.Bar(
-                name='AM Scenario',
-                x=edited_results['Country'],
-                y=edited_results['AM Scenario (kg CO2e)'],
-                marker_color='#008b8b',
-                text=edited_results['AM Scenario (kg CO2e)'].round(1),
-                textposition='outside'
-            ))
-            fig_bar.update_layout(
-                barmode='group',
-                xaxis_title='Country',
-                yaxis_title='GWP (kg CO₂e)',
-                height=400,
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
-        
-        with col_v2:
-            st.subheader("Dual-line Chart")
-            fig_line = go.Figure()
-            fig_line.add_trace(go.Scatter(
-                x=edited_results['Country'],
-                y=edited_results['Baseline (kg CO2e)'],
-                mode='lines+markers',
-                name='Baseline',
-                line=dict(color='#5b2c6f', width=3),
-                marker=dict(size=10)
-            ))
-            fig_line.add_trace(go.Scatter(
-                x=edited_results['Country'],
-                y=edited_results['AM Scenario (kg CO2e)'],
-                mode='lines+markers',
-                name='AM Scenario',
-                line=dict(color='#008b8b', width=3),
-                marker=dict(size=10)
-            ))
-            fig_line.update_layout(
-                xaxis_title='Country',
-                yaxis_title='GWP (kg CO₂e)',
-                height=400,
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        st.info("📌 The data below is calculated from your input parameters on Page 1")
+        
+        # Computing and previewing every country is deferred to an explicit click, so typing
+        # into the report text areas doesn't redo it; the frame persists in session state
+        report_inputs = tuple(inputs.items())
+        if st.button("📊 Compute & Preview Report", key="compute_report"):
+            st.session_state["report_inputs"] = report_inputs
+            st.session_state["report_results"] = pre.results
+        results_df = st.session_state.get("report_results")
+        edited_results = None
+
+        if results_df is None:
+            st.info("Click **Compute & Preview Report** to calculate the results and preview the charts.")
+        else:
+            if st.session_state.get("report_inputs") != report_inputs:
+                st.warning("⚠ Page 1 inputs have changed since the last computation. Click **Compute & Preview Report** to refresh.")
+        
+            # Values stay unrounded; display precision comes from the column formats
+            results_column_config = {
+                'Baseline (kg CO2e)': st.column_config.NumberColumn(format="%.2f"),
+                'AM Scenario (kg CO2e)': st.column_config.NumberColumn(format="%.2f"),
+                'Reduction (%)': st.column_config.NumberColumn(format="%.1f%%")
+            }
+            st.dataframe(
+                results_df.style.background_gradient(subset=['Reduction (%)'], cmap='Greens'),
+                column_config=results_column_config,
+                use_container_width=True
             )
-            st.plotly_chart(fig_line, use_container_width=True)
         
-        # Reduction percentage bar chart
-        st.subheader("Reduction Rate by Country")
-        fig_reduction = go.Figure()
-        fig_reduction.add_trace(go.Bar(
-            x=edited_results['Country'],
-            y=edited_results['Reduction (%)'],
-            marker_color='#2ecc71',
-            text=edited_results['Reduction (%)'].round(1),
-            texttemplate='%{text}%',
-            textposition='outside'
-        ))
-        fig_reduction.update_layout(
-            xaxis_title='Country',
-            yaxis_title='Reduction (%)',
-            height=350,
-            showlegend=False
-        )
-        st.plotly_chart(fig_reduction, use_container_width=True)
+            # Allow user to edit results if needed
+            st.markdown("**Optional: Edit results manually for the report**")
+            edited_results = st.data_editor(results_df, column_config=results_column_config, num_rows="dynamic",
+                                            use_container_width=True, key="edited_results")
         
-        # World Map
-        st.subheader("Geographic Distribution of GWP Reduction")
-        fig_map = go.Figure(data=go.Choropleth(
-            locations=edited_results['Country'],
-            locationmode='country names',
-            z=edited_results['Reduction (%)'],
-            text=edited_results['Country'],
-            colorscale='Greens',
-            colorbar_title='Reduction %',
-            marker_line_color='darkgray',
-            marker_line_width=0.5,
-        ))
-        fig_map.update_layout(
-            geo=dict(
-                showframe=False,
-                showcoastlines=True,
-                projection_type='natural earth'
-            ),
-            height=400
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
+            # 4. Visualization Preview
+            st.header("4. Visualization Preview")
+            st.markdown("The following charts will be included in the PDF report:")
         
+            # Editor reruns with unchanged contents reuse the same figures; the page shows
+            # one combined preview while the PDF embeds the individual charts
+            fig_all, report_fig_jsons = build_report_figures(
+                results_frame_key(edited_results), edited_results
+            )
+            st.plotly_chart(fig_all, use_container_width=True, theme=None)
+
         # 5. Interpretation
         st.header("5. Interpretation")
         interpretation = st.text_area(
@@ -533,232 +807,159 @@ elif page == pages[1]:
             report_version = st.text_input("Report Version", value="v1.0", key="version")
         
         # PDF Generation Function
-        def format_text_for_pdf(text):
-            """Convert markdown-style bold (**text**) to HTML bold tags and escape HTML entities"""
-            # Escape HTML special characters first
-            text = text.replace('&', '&amp;')
-            text = text.replace('<', '&lt;')
-            text = text.replace('>', '&gt;')
-            # Replace **text** with <b>text</b>
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-            return text
-        
-        def escape_html(text):
-            """Escape HTML special characters"""
-            text = str(text)
-            text = text.replace('&', '&amp;')
-            text = text.replace('<', '&lt;')
-            text = text.replace('>', '&gt;')
-            return text
-        
         def create_lca_pdf_report(data_df, exec_sum, func_unit, assess_method, tool, data_src, 
                                  data_qual, interpret, concl, author, org, project, version,
-                                 fig_bar, fig_line, fig_reduction, fig_map):
+                                 bar_json, line_json, reduction_json, map_json):
             """Generate comprehensive LCA PDF report"""
+            # ReportLab is only loaded once a report is actually generated
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak, Image
+
             buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                                   rightMargin=50, leftMargin=50, 
-                                   topMargin=50, bottomMargin=30)
-            
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'ReportTitle',
-                parent=styles['Heading1'],
-                fontSize=22,
-                textColor=colors.HexColor('#5b2c6f'),
-                spaceAfter=20,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            )
-            
-            heading1_style = ParagraphStyle(
-                'CustomHeading1',
-                parent=styles['Heading1'],
-                fontSize=16,
-                textColor=colors.HexColor('#5b2c6f'),
-                spaceAfter=12,
-                spaceBefore=12,
-                fontName='Helvetica-Bold'
-            )
-            
-            heading2_style = ParagraphStyle(
-                'CustomHeading2',
-                parent=styles['Heading2'],
-                fontSize=13,
-                textColor=colors.HexColor('#008b8b'),
-                spaceAfter=8,
-                spaceBefore=8,
-                fontName='Helvetica-Bold'
-            )
-            
-            # Report Title
-            story.append(Paragraph("LCA Report", title_style))
-            story.append(Paragraph("Baseline vs AM Scenario - GWP Comparison", heading2_style))
-            story.append(Spacer(1, 15))
-            
-            # Report metadata
-            metadata = f"""
-            <b>Project:</b> {escape_html(project)}<br/>
-            <b>Organization:</b> {escape_html(org)}<br/>
-            <b>Author:</b> {escape_html(author)}<br/>
-            <b>Version:</b> {escape_html(version)}<br/>
-            <b>Date:</b> {datetime.now().strftime('%B %d, %Y')}
-            """
-            story.append(Paragraph(metadata, styles['Normal']))
-            story.append(Spacer(1, 30))
-            story.append(PageBreak())
-            
-            # 1. Executive Summary
-            story.append(Paragraph("1. Executive Summary", heading1_style))
-            story.append(Spacer(1, 10))
-            for line in exec_sum.split('\n'):
-                if line.strip():
-                    formatted_line = format_text_for_pdf(line)
-                    story.append(Paragraph(formatted_line, styles['Normal']))
-                    story.append(Spacer(1, 8))
-            story.append(Spacer(1, 20))
-            
-            # 2. Methodology
-            story.append(Paragraph("2. Methodology", heading1_style))
-            story.append(Spacer(1, 10))
-            
-            methodology_content = f"""
-            <b>Functional Unit:</b> {escape_html(func_unit)}<br/>
-            <b>Assessment Method:</b> {escape_html(assess_method)}<br/>
-            <b>Assessment Tool:</b> {escape_html(tool)}<br/>
-            <b>Data Source:</b> {escape_html(data_src)}<br/>
-            """
-            story.append(Paragraph(methodology_content, styles['Normal']))
-            story.append(Spacer(1, 12))
-            
-            story.append(Paragraph("<b>Data Quality & Assumptions:</b>", styles['Normal']))
-            story.append(Spacer(1, 8))
-            for line in data_qual.split('\n'):
-                if line.strip():
-                    formatted_line = format_text_for_pdf(line)
-                    story.append(Paragraph(formatted_line, styles['Normal']))
-                    story.append(Spacer(1, 6))
-            
-            story.append(PageBreak())
-            
-            # 3. Results
-            story.append(Paragraph("3. Results - GWP Comparison", heading1_style))
-            story.append(Spacer(1, 10))
-            story.append(Paragraph("Country-level Baseline vs AM Scenario GWP:", heading2_style))
-            story.append(Spacer(1, 12))
-            
-            # Results table
-            table_data = [['Country', 'Baseline\n(kg CO₂e)', 'AM Scenario\n(kg CO₂e)', 'Reduction\n(%)']]
-            for _, row in data_df.iterrows():
-                table_data.append([
-                    row['Country'],
-                    f"{row['Baseline (kg CO2e)']:.2f}",
-                    f"{row['AM Scenario (kg CO2e)']:.2f}",
-                    f"{row['Reduction (%)']}%"
-                ])
-            
-            # Add statistics row
-            avg_baseline = data_df['Baseline (kg CO2e)'].mean()
-            avg_am = data_df['AM Scenario (kg CO2e)'].mean()
-            avg_reduction = data_df['Reduction (%)'].mean()
-            table_data.append(['Average', f"{avg_baseline:.2f}", f"{avg_am:.2f}", f"{avg_reduction:.1f}%"])
-            
-            results_table = Table(table_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.2*inch])
-            results_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5b2c6f')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('TOPPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -2), colors.HexColor('#f5f5f5')),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e0e0e0')),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')])
-            ]))
-            story.append(results_table)
-            story.append(PageBreak())
-            
-            # 4. Visualization
-            story.append(Paragraph("4. Visualization", heading1_style))
-            story.append(Spacer(1, 15))
-            
-            # Save charts as temporary images
-            temp_files = []
-            
             try:
-                # Bar Chart
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp1:
-                    fig_bar.write_image(tmp1.name, width=900, height=500, scale=2)
-                    temp_files.append(tmp1.name)
-                    story.append(Paragraph("Bar Chart: Country-level Baseline vs AM Scenario GWP", heading2_style))
-                    story.append(Spacer(1, 8))
-                    img1 = Image(tmp1.name, width=6*inch, height=3.3*inch)
-                    story.append(img1)
-                    story.append(Spacer(1, 20))
+                doc = SimpleDocTemplate(buffer, pagesize=A4, 
+                                       rightMargin=50, leftMargin=50, 
+                                       topMargin=50, bottomMargin=30)
                 
-                # Line Chart
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp2:
-                    fig_line.write_image(tmp2.name, width=900, height=500, scale=2)
-                    temp_files.append(tmp2.name)
-                    story.append(Paragraph("Dual-line Chart: Trend Comparison (Baseline vs AM)", heading2_style))
-                    story.append(Spacer(1, 8))
-                    img2 = Image(tmp2.name, width=6*inch, height=3.3*inch)
-                    story.append(img2)
-                
-                story.append(PageBreak())
+                story = []
+                styles, title_style, heading1_style, heading2_style = pdf_styles()
                 
-                # Reduction Chart
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp3:
-                    fig_reduction.write_image(tmp3.name, width=900, height=450, scale=2)
-                    temp_files.append(tmp3.name)
-                    story.append(Paragraph("GWP Reduction Rate by Country", heading2_style))
-                    story.append(Spacer(1, 8))
-                    img3 = Image(tmp3.name, width=6*inch, height=3*inch)
-                    story.append(img3)
-                    story.append(Spacer(1, 20))
-                
-                # World Map
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp4:
-                    fig_map.write_image(tmp4.name, width=900, height=500, scale=2)
-                    temp_files.append(tmp4.name)
-                    story.append(Paragraph("Geographic Distribution: Reduction Map (World View)", heading2_style))
-                    story.append(Spacer(1, 8))
-                    img4 = Image(tmp4.name, width=6*inch, height=3.3*inch)
-                    story.append(img4)
+                # Report Title
+                story.append(Paragraph("LCA Report", title_style))
+                story.append(Paragraph("Baseline vs AM Scenario - GWP Comparison", heading2_style))
+                story.append(Spacer(1, 15))
                 
+                # Report metadata
+                metadata = f"""
+                <b>Project:</b> {escape_html(project)}<br/>
+                <b>Organization:</b> {escape_html(org)}<br/>
+                <b>Author:</b> {escape_html(author)}<br/>
+                <b>Version:</b> {escape_html(version)}<br/>
+                <b>Date:</b> {datetime.now().strftime('%B %d, %Y')}
+                """
+                story.append(Paragraph(metadata, styles['Normal']))
+                story.append(Spacer(1, 30))
                 story.append(PageBreak())
                 
-                # 5. Interpretation
-                story.append(Paragraph("5. Interpretation", heading1_style))
+                # 1. Executive Summary
+                story.append(Paragraph("1. Executive Summary", heading1_style))
                 story.append(Spacer(1, 10))
-                for line in interpret.split('\n'):
+                for line in exec_sum.split('\n'):
                     if line.strip():
                         formatted_line = format_text_for_pdf(line)
                         story.append(Paragraph(formatted_line, styles['Normal']))
                         story.append(Spacer(1, 8))
                 story.append(Spacer(1, 20))
                 
-                # 6. Conclusion
-                story.append(Paragraph("6. Conclusion", heading1_style))
+                # 2. Methodology
+                story.append(Paragraph("2. Methodology", heading1_style))
                 story.append(Spacer(1, 10))
-                for line in concl.split('\n'):
+                
+                methodology_content = f"""
+                <b>Functional Unit:</b> {escape_html(func_unit)}<br/>
+                <b>Assessment Method:</b> {escape_html(assess_method)}<br/>
+                <b>Assessment Tool:</b> {escape_html(tool)}<br/>
+                <b>Data Source:</b> {escape_html(data_src)}<br/>
+                """
+                story.append(Paragraph(methodology_content, styles['Normal']))
+                story.append(Spacer(1, 12))
+                
+                story.append(Paragraph("<b>Data Quality & Assumptions:</b>", styles['Normal']))
+                story.append(Spacer(1, 8))
+                for line in data_qual.split('\n'):
                     if line.strip():
                         formatted_line = format_text_for_pdf(line)
                         story.append(Paragraph(formatted_line, styles['Normal']))
-                        story.append(Spacer(1, 8))
+                        story.append(Spacer(1, 6))
+                
+                story.append(PageBreak())
+                
+                # 3. Results
+                story.append(Paragraph("3. Results - GWP Comparison", heading1_style))
+                story.append(Spacer(1, 10))
+                story.append(Paragraph("Country-level Baseline vs AM Scenario GWP:", heading2_style))
+                story.append(Spacer(1, 12))
+                
+                # Results table
+                table_data = [['Country', 'Baseline\n(kg CO₂e)', 'AM Scenario\n(kg CO₂e)', 'Reduction\n(%)']]
+                table_records = data_df[['Country', 'Baseline (kg CO2e)', 'AM Scenario (kg CO2e)', 'Reduction (%)']].itertuples(
+                    index=False, name=None
+                )
+                table_data += [[country, f"{baseline:.2f}", f"{am:.2f}", f"{reduction:.1f}%"]
+                               for country, baseline, am, reduction in table_records]
+                
+                # Add statistics row
+                avg_baseline, avg_am, avg_reduction = column_means(
+                    data_df, ['Baseline (kg CO2e)', 'AM Scenario (kg CO2e)', 'Reduction (%)']
+                )
+                table_data.append(['Average', f"{avg_baseline:.2f}", f"{avg_am:.2f}", f"{avg_reduction:.1f}%"])
+                
+                results_table = Table(table_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.2*inch])
+                results_table.setStyle(pdf_results_table_style(len(table_data)))
+                story.append(results_table)
+                story.append(PageBreak())
+                
+                # 4. Visualization
+                story.append(Paragraph("4. Visualization", heading1_style))
+                story.append(Spacer(1, 15))
+                
+                # Kaleido renders block on a browser subprocess, so the four charts render concurrently.
+                # Bar and line charts stay vector; the map is rasterized to fit its 6-inch slot at 200 dpi
+                vector_jobs = [(bar_json, 900, 495), (line_json, 900, 495), (reduction_json, 900, 450)]
+                with ThreadPoolExecutor(max_workers=len(vector_jobs) + 1) as executor:
+                    svg_futures = [executor.submit(render_figure_svg, fig_json, w, h) for fig_json, w, h in vector_jobs]
+                    map_future = executor.submit(render_figure_png, map_json, 1200, 660)
+                    svg_bar, svg_line, svg_reduction = (future.result() for future in svg_futures)
+                    png_map = map_future.result()
+                
+                # Bar Chart
+                story.extend([
+                    Paragraph("Bar Chart: Country-level Baseline vs AM Scenario GWP", heading2_style),
+                    Spacer(1, 8),
+                    svg_drawing(svg_bar, 6*inch),
+                    Spacer(1, 20),
+                ])
+                
+                # Line Chart
+                story.extend([
+                    Paragraph("Dual-line Chart: Trend Comparison (Baseline vs AM)", heading2_style),
+                    Spacer(1, 8),
+                    svg_drawing(svg_line, 6*inch),
+                    PageBreak(),
+                ])
+                
+                # Reduction Chart
+                story.extend([
+                    Paragraph("GWP Reduction Rate by Country", heading2_style),
+                    Spacer(1, 8),
+                    svg_drawing(svg_reduction, 6*inch),
+                    Spacer(1, 20),
+                ])
+                
+                # World Map
+                story.extend([
+                    Paragraph("Geographic Distribution: Reduction Map (World View)", heading2_style),
+                    Spacer(1, 8),
+                    Image(io.BytesIO(png_map), width=6*inch, height=3.3*inch),
+                    PageBreak(),
+                ])
+                
+                # 5. Interpretation
+                story.extend([Paragraph("5. Interpretation", heading1_style), Spacer(1, 10)])
+                for paragraph in format_paragraphs_for_pdf(interpret):
+                    story.extend([Paragraph(paragraph, styles['Normal']), Spacer(1, 8)])
+                story.append(Spacer(1, 20))
+                
+                # 6. Conclusion
+                story.extend([Paragraph("6. Conclusion", heading1_style), Spacer(1, 10)])
+                for paragraph in format_paragraphs_for_pdf(concl):
+                    story.extend([Paragraph(paragraph, styles['Normal']), Spacer(1, 8)])
                 
                 # Build PDF
                 doc.build(story)
-                buffer.seek(0)
                 
-                return buffer, temp_files
+                return buffer.getvalue()
                 
             except Exception as e:
                 raise Exception(f"Error creating PDF: {str(e)}")
@@ -768,48 +969,47 @@ elif page == pages[1]:
         st.header("8. Generate PDF Report")
         
         if st.button("🎯 Generate PDF Report", type="primary", key="generate_pdf"):
-            if not edited_results.empty:
+            if edited_results is not None and not edited_results.empty:
                 try:
-                    with st.spinner("Generating comprehensive PDF report... This may take a moment."):
-                        pdf_buffer, temp_files = create_lca_pdf_report(
-                            edited_results, 
-                            exec_summary,
-                            functional_unit,
-                            method,
-                            assessment_tool,
-                            data_source,
-                            data_quality,
-                            interpretation,
-                            conclusion,
-                            report_author,
-                            organization,
-                            project_name,
-                            report_version,
-                            fig_bar,
-                            fig_line,
-                            fig_reduction,
-                            fig_map
-                        )
+                    # Everything the PDF depends on (the date is printed on the title page); an
+                    # unchanged report is served from the previous bytes instead of rebuilt
+                    pdf_digest = report_digest(
+                        results_frame_key(edited_results), exec_summary, functional_unit, method,
+                        assessment_tool, data_source, data_quality, interpretation, conclusion,
+                        report_author, organization, project_name, report_version,
+                        datetime.now().strftime('%Y-%m-%d')
+                    )
+                    if st.session_state.get("pdf_digest") != pdf_digest:
+                        with st.spinner("Generating comprehensive PDF report... This may take a moment."):
+                            st.session_state["pdf_bytes"] = create_lca_pdf_report(
+                                edited_results, 
+                                exec_summary,
+                                functional_unit,
+                                method,
+                                assessment_tool,
+                                data_source,
+                                data_quality,
+                                interpretation,
+                                conclusion,
+                                report_author,
+                                organization,
+                                project_name,
+                                report_version,
+                                *report_fig_jsons
+                            )
+                        st.session_state["pdf_digest"] = pdf_digest
                     
                     st.success("✅ PDF Report Generated Successfully!")
                     
                     filename = f"LCA_Report_Baseline_vs_AM_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
                     st.download_button(
                         label="📥 Download PDF Report",
-                        data=pdf_buffer,
+                        data=st.session_state["pdf_bytes"],
                         file_name=filename,
                         mime="application/pdf",
                         key="download_pdf"
                     )
                     
-                    # Clean up temporary files
-                    for tmp_file in temp_files:
-                        try:
-                            if os.path.exists(tmp_file):
-                                os.remove(tmp_file)
-                        except:
-                            pass
-                    
                     st.info("💡 The PDF includes all sections with visualizations and detailed analysis.")
                     
                 except Exception as e: